@@ -13,29 +13,300 @@ The output HTML map includes:
 Usage (from command line):
     python create_report.py --csv data.csv --geojson zipcodes.geojson --output map.html
 
+    # Optionally serve ZIP polygons as vector tiles (requires tippecanoe on PATH)
+    python create_report.py --csv data.csv --geojson zipcodes.geojson --output map.html --pmtiles zips.pmtiles
+
 Dependencies:
+    - numpy:      for array-based lookups over per-ZIP request counts
     - pandas:     for structured CSV reading and data manipulation
     - geopandas:  for merging ZIP geometries and handling spatial joins
     - folium:     for building the interactive Leaflet.js-based map
     - branca:     for color scales and custom HTML/JS injection in folium
+    - orjson:     for fast serialization of the embedded ZIP GeoJSON
     - shapely:    for centroid and geometry operations on ZIP polygons
 """
 
 # --- Standard library (CLI interface)
 import argparse                                          # Parses command-line args for input/output file paths
+from concurrent.futures import ThreadPoolExecutor        # Builds independent data layers concurrently
+import hashlib                                           # Content hashes of inputs for the report cache
+import os                                                # Resolves output paths and sizes the layer worker pool
+import shutil                                            # Locates tippecanoe and copies cached reports
+import subprocess                                        # Runs tippecanoe to build vector tiles
+import tempfile                                          # Scratch files for tippecanoe input and atomic cache writes
+from functools import lru_cache                          # Memoizes repeated legend color blending
+from typing import Optional                              # Optional PMTiles output path
 
 # --- Data wrangling
+import numpy as np                                       # Distinct request counts for colormap lookups
 import pandas as pd                                      # Loads and filters request count CSVs
 import geopandas as gpd                                  # Joins request data with ZIP code geometries
 
 # --- Interactive map rendering
+import branca                                            # Version string for the report cache key
 import folium                                            # Builds the Leaflet.js map and visual layers
-from branca.colormap import linear, LinearColormap       # Generates gradient legends and scales
+import orjson                                            # Fast serialization of the ZIP GeoJSON embedded in the map
+from branca.colormap import LinearColormap               # Generates gradient legends and scales
+from branca.element import Element, MacroElement         # Base classes for custom JS elements in the map
+from folium.elements import JSCSSMixin                   # Adds external JS links (protomaps-leaflet) to the page
+from folium.template import Template                     # Jinja template with folium's JS filters
+from matplotlib.colors import to_rgb                     # Parses colormap hex strings for legend blending
 
 # --- Geometry calculations
-from shapely.geometry import Point                       # Used for computing ZIP code centroids
+import shapely                                           # Vectorized centroids and simplification of ZIP polygons
+
+def to_js_literal(obj) -> str:
+    """Serialize `obj` (NumPy arrays included) to JSON for inlining in a <script> block."""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode().replace("</", "<\\/")
+
+# Leaflet layer that draws labels onto a single canvas instead of one DOM node per label; labels are
+# given as parallel [lats, lons, texts] columns
+CANVAS_LABELS_JS = """
+L.CanvasLabels = L.Layer.extend({
+  initialize: function (labels) {
+    [this._lats, this._lons, this._texts] = labels;
+  },
+  onAdd: function (map) {
+    if (!map.getPane('canvasLabels')) {
+      const pane = map.createPane('canvasLabels');
+      pane.style.zIndex = 600;  // Same level as markerPane, below tooltipPane (650)
+      pane.style.pointerEvents = 'none';
+    }
+    this._canvas = L.DomUtil.create('canvas', 'leaflet-zoom-hide', map.getPane('canvasLabels'));
+    map.on('moveend zoomend resize', this._redraw, this);
+    this._redraw();
+  },
+  onRemove: function (map) {
+    map.off('moveend zoomend resize', this._redraw, this);
+    L.DomUtil.remove(this._canvas);
+  },
+  _redraw: function () {
+    // Like L.Canvas, draw past the viewport by PADDING on each side so labels are already there while panning
+    const PADDING = 0.3;
+    const map = this._map, ratio = window.devicePixelRatio || 1;
+    const offset = map.getSize().multiplyBy(PADDING).round(), size = map.getSize().add(offset.multiplyBy(2));
+    const canvas = this._canvas, ctx = canvas.getContext('2d');
+    L.DomUtil.setPosition(canvas, map.containerPointToLayerPoint(offset.multiplyBy(-1)));
+    canvas.width = size.x * ratio;
+    canvas.height = size.y * ratio;
+    canvas.style.width = size.x + 'px';
+    canvas.style.height = size.y + 'px';
+    ctx.scale(ratio, ratio);
+    ctx.translate(offset.x, offset.y);
+    ctx.font = 'bold 10pt "Helvetica Neue", Arial, Helvetica, sans-serif';
+    ctx.textAlign = 'center';
+    ctx.textBaseline = 'middle';
+    ctx.fillStyle = 'black';
+    for (let i = 0; i < this._texts.length; i++) {
+      const point = map.latLngToContainerPoint([this._lats[i], this._lons[i]]);
+      ctx.fillText(this._texts[i], point.x, point.y);
+    }
+  }
+});
+"""
+
+class CanvasLabels(MacroElement):
+    """Folium element adding an L.CanvasLabels layer of labels at (lat, lon) points to its parent layer."""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = new L.CanvasLabels(
+                {{ this.labels }}
+            ).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, lats: np.ndarray, lons: np.ndarray, texts: list):
+        super().__init__()
+        self._name = "CanvasLabels"
+        self.labels = to_js_literal([lats, lons, texts])
+
+    def render(self, **kwargs):
+        # Define the layer class once per page, ahead of the first instance that uses it
+        self.get_root().script.add_child(Element(CANVAS_LABELS_JS), name="canvas_labels")
+        super().render(**kwargs)
+
+class ZipChoropleth(MacroElement):
+    """
+    Folium element rendering every ZIP polygon as one L.geoJSON layer restyled on base layer changes.
+
+    The GeoJSON is pre-serialized with orjson (see `to_js_literal`) and emitted in a single script block, bypassing
+    folium's per-feature GeoJson rendering. Each feature carries `counts` and `bins` arrays with
+    one entry per name in `layers`; a feature is filled with `palette[bins[layer_index]]`.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }}_layers = {{ this.layers|tojson }};
+            var {{ this.get_name() }}_palette = {{ this.palette|tojson }};
+            var {{ this.get_name() }}_layer = {{ this.layers.index(this.initial_layer) }};
+            function {{ this.get_name() }}_style(feature) {
+                return Object.assign(
+                    { fillColor: {{ this.get_name() }}_palette[feature.properties.bins[{{ this.get_name() }}_layer]] },
+                    {{ this.style|tojson }}
+                );
+            }
+            var {{ this.get_name() }} = L.geoJSON({{ this.data }}, {
+                pane: "shadowPane",
+                style: {{ this.get_name() }}_style,
+                onEachFeature: function (feature, layer) {
+                    layer.on({
+                        mouseover: e => e.target.setStyle({{ this.highlight_style|tojson }}),
+                        mouseout: e => {{ this.get_name() }}.resetStyle(e.target),
+                    });
+                }
+            }).addTo({{ this._parent.get_name() }});
+            {{ this.get_name() }}.bindTooltip(layer => {
+                const props = layer.feature.properties;
+                return `<b>Zip Code:</b> ${props.ZIPNUM}<br>`
+                    + `<b>Zip Name:</b> ${props.ZIPNAME}<br>`
+                    + `<b>Requests:</b> ${props.counts[{{ this.get_name() }}_layer].toLocaleString()}`;
+            }, { sticky: true });
+            {{ this._parent.get_name() }}.on("baselayerchange", function (e) {
+                const index = {{ this.get_name() }}_layers.indexOf(e.name);
+                if (index === -1) return;  // Not one of our data layers
+                {{ this.get_name() }}_layer = index;
+                {{ this.get_name() }}.setStyle({{ this.get_name() }}_style);
+            });
+        {% endmacro %}
+    """)
+
+    def __init__(self, geo_dict: dict, layers: list, palette: list, initial_layer: str, style: dict, highlight_style: dict):
+        super().__init__()
+        self._name = "ZipChoropleth"
+        self.data = to_js_literal(geo_dict)
+        self.layers = layers
+        self.palette = palette
+        self.initial_layer = initial_layer
+        self.style = style
+        self.highlight_style = highlight_style
+
+class ZipVectorTiles(JSCSSMixin, MacroElement):
+    """
+    Folium element drawing ZIP polygons from a PMTiles archive with protomaps-leaflet.
+
+    Tile features carry one `b<i>` palette index per name in `layers` (tippecanoe cannot keep
+    array properties); the tiles are repainted when the base layer changes.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }}_layers = {{ this.layers|tojson }};
+            var {{ this.get_name() }}_palette = {{ this.palette|tojson }};
+            var {{ this.get_name() }}_layer = {{ this.layers.index(this.initial_layer) }};
+            var {{ this.get_name() }} = protomapsL.leafletLayer({
+                url: {{ this.url|tojson }},
+                paintRules: [
+                    {
+                        dataLayer: {{ this.data_layer|tojson }},
+                        symbolizer: new protomapsL.PolygonSymbolizer({
+                            fill: (z, f) => {{ this.get_name() }}_palette[f.props["b" + {{ this.get_name() }}_layer]],
+                            opacity: {{ this.style.fillOpacity }}
+                        })
+                    },
+                    {
+                        dataLayer: {{ this.data_layer|tojson }},
+                        symbolizer: new protomapsL.LineSymbolizer({
+                            color: {{ this.style.color|tojson }},
+                            width: {{ this.style.weight }}
+                        })
+                    }
+                ],
+                labelRules: []
+            }).addTo({{ this._parent.get_name() }});
+            {{ this._parent.get_name() }}.on("baselayerchange", function (e) {
+                const index = {{ this.get_name() }}_layers.indexOf(e.name);
+                if (index === -1) return;  // Not one of our data layers
+                {{ this.get_name() }}_layer = index;
+                {{ this.get_name() }}.rerenderTiles();
+            });
+        {% endmacro %}
+    """)
+
+    default_js = [
+        ("protomaps_leaflet", "https://unpkg.com/protomaps-leaflet@5.0.0/dist/protomaps-leaflet.js"),
+    ]
+
+    def __init__(self, url: str, data_layer: str, layers: list, palette: list, initial_layer: str, style: dict):
+        super().__init__()
+        self._name = "ZipVectorTiles"
+        self.url = url
+        self.data_layer = data_layer
+        self.layers = layers
+        self.palette = palette
+        self.initial_layer = initial_layer
+        self.style = style
+
+def build_pmtiles(features: gpd.GeoDataFrame, pmtiles_path: str, data_layer: str) -> None:
+    """Write ZIP features to a PMTiles archive with tippecanoe, using a temporary GeoJSON as input."""
+    if shutil.which("tippecanoe") is None:
+        raise RuntimeError("tippecanoe must be installed and on PATH to write PMTiles output")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        geojson_tmp = os.path.join(tmp_dir, "zips.geojson")
+        features.to_file(geojson_tmp, driver="GeoJSON")
+        # Coalesce (rather than drop) dense features and simplify shared borders together, so low zooms
+        # keep a gap-free coverage without slivers between neighboring ZIPs
+        subprocess.run(
+            ["tippecanoe", "-zg", "--coalesce-densest-as-needed", "--extend-zooms-if-still-dropping",
+             "--detect-shared-borders", "--force", "-l", data_layer, "-o", pmtiles_path, geojson_tmp],
+            check=True
+        )
 
-def create_report(csv_path: str, geojson_path: str, output_path: str) -> None:
+def report_cache_dir() -> str:
+    """Return the per-user report cache directory, creating it (owner-only, mode 0700) if needed."""
+    cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_dir = os.path.join(cache_root, "extension-reports")
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    os.chmod(cache_dir, 0o700)  # makedirs' mode is masked by umask and ignored for existing dirs
+    return cache_dir
+
+def atomic_copy(src: str, dst: str) -> None:
+    """Copy `src` to `dst` via a temporary file in dst's directory, so `dst` is never left partially written."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dst)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out, open(src, "rb") as f:
+            shutil.copyfileobj(f, out)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+@lru_cache(maxsize=None)
+def simulate_opacity(hex_color: str, alpha: float) -> str:
+    """Blend white with a given hex color to simulate opacity on non-transparent elements."""
+    r, g, b = to_rgb(hex_color)
+    r = int((1 - alpha) * 255 + alpha * r * 255)
+    g = int((1 - alpha) * 255 + alpha * g * 255)
+    b = int((1 - alpha) * 255 + alpha * b * 255)
+    return f'rgb({r},{g},{b})'
+
+def build_legend_html(layer_name: str, colormap: LinearColormap, max_val: float, unknown_count: int) -> str:
+    """Render the gradient legend (plus the "Unknown" ZIP count) shown while `layer_name` is selected."""
+    start_color = simulate_opacity(colormap(1), 0.7)
+    end_color = simulate_opacity(colormap(max_val), 0.7)
+
+    return f"""
+    <div style='line-height:1.3'>
+      <b>Requests per ZIP Code</b><br>
+      <svg width="100%" height="20">
+        <defs>
+          <linearGradient id="grad_{layer_name}" x1="0%" y1="0%" x2="100%" y2="0%">
+            <stop offset="0%" stop-color="{start_color}"/>
+            <stop offset="100%" stop-color="{end_color}"/>
+          </linearGradient>
+        </defs>
+        <rect width="100%" height="20" fill="url(#grad_{layer_name})"/>
+      </svg>
+      <div style="display:flex; justify-content:space-between">
+        <span>1</span><span>{max_val}</span>
+      </div>
+    </div>
+    <div><b>Unknown ZIPs:</b> {unknown_count}</div>
+    """.replace("\n", "")
+
+def create_report(csv_path: str, geojson_path: str, output_path: str, pmtiles_path: Optional[str] = None,
+                  use_cache: bool = False) -> None:
     """
     Creates a ZIP-code-level folium map showing Gardening Helpline request volumes.
 
@@ -44,20 +315,54 @@ def create_report(csv_path: str, geojson_path: str, output_path: str) -> None:
                         Expected structure: ZIP code index, columns for 'Aggregate', months, and optionally 'Unknown'.
         geojson_path (str): Path to a GeoJSON file with ZIP code polygons. Must include a 'ZIPNUM' property.
         output_path (str): Path to save the generated interactive HTML map.
+        pmtiles_path (str, optional): If given, ZIP polygons are written to this PMTiles archive (the name
+                        must end in '.pmtiles') with tippecanoe and loaded as vector tiles instead of
+                        being embedded in the HTML.
+                        The archive is referenced relative to the HTML and must be served over HTTP.
+        use_cache (bool): Reuse the outputs of a previous run (kept in ~/.cache/extension-reports, or under
+                        $XDG_CACHE_HOME) when the CSV, GeoJSON, this script and the PMTiles location are
+                        all unchanged. Off by default.
 
     Returns:
-        None. Writes a fully self-contained HTML map to the specified output path.
+        None. Writes a fully self-contained HTML map to the specified output path
+        (plus the PMTiles archive when `pmtiles_path` is given).
     """
 
+    # ===========================
+    # Reuse a previous build for identical inputs
+    # ===========================
+    pmtiles_url = None
+    if pmtiles_path:
+        # tippecanoe silently writes MBTiles (which protomaps-leaflet can't read) for other suffixes
+        if not pmtiles_path.endswith(".pmtiles"):
+            raise ValueError(f"PMTiles output path must end in '.pmtiles': {pmtiles_path}")
+        pmtiles_url = os.path.relpath(pmtiles_path, start=os.path.dirname(os.path.abspath(output_path)))
+
+    cache_prefix = None
+    if use_cache:
+        digest = hashlib.blake2b(digest_size=8)
+        for path in (csv_path, geojson_path, __file__):
+            with open(path, "rb") as f:
+                digest.update(hashlib.blake2b(f.read()).digest())
+        # folium/branca pick the page template and CDN assets (Leaflet etc.), so a library upgrade must miss
+        digest.update(f"{pmtiles_url}|{folium.__version__}|{branca.__version__}".encode())
+        cache_prefix = os.path.join(report_cache_dir(), f"report_{digest.hexdigest()}")
+
+        if os.path.exists(cache_prefix + ".html") and (not pmtiles_path or os.path.exists(cache_prefix + ".pmtiles")):
+            if pmtiles_path:
+                shutil.copyfile(cache_prefix + ".pmtiles", pmtiles_path)
+            shutil.copyfile(cache_prefix + ".html", output_path)
+            return
+
     # ===========================
     # Load and preprocess data
     # ===========================
     df = pd.read_csv(csv_path, index_col=0)
     gdf = gpd.read_file(geojson_path)
 
-    # Ensure ZIP code identifiers are strings for merging
+    # Ensure ZIP code identifiers are strings for merging; stray whitespace (e.g. "Unknown ") is stripped
     gdf["ZIPNUM"] = gdf["ZIPNUM"].astype(str)
-    df.index = df.index.astype(str)
+    df.index = df.index.astype(str).str.strip()
 
     # Compute "Aggregate" if not pre-computed in the CSV
     if "Aggregate" not in df.columns:
@@ -68,169 +373,157 @@ def create_report(csv_path: str, geojson_path: str, output_path: str) -> None:
 
     # Map layers to generate
     data_layers = ["Aggregate"] + months
+    initial_layer = "Aggregate"
 
     # Exclude ZIP code "Unknown" when computing color scale maxima
-    df_no_unknown = df.loc[~df.index.to_series().str.strip().eq("Unknown")]
+    df_no_unknown = df.drop(index="Unknown", errors="ignore")
     max_vals = {col: df_no_unknown[col].max() for col in data_layers}
 
     # ===========================
     # Colormap setup
     # ===========================
-    def simulate_opacity(hex_color: str, alpha: float) -> str:
-        """Blend white with a given hex color to simulate opacity on non-transparent elements."""
-        from matplotlib.colors import to_rgb
-        r, g, b = to_rgb(hex_color)
-        r = int((1 - alpha) * 255 + alpha * r * 255)
-        g = int((1 - alpha) * 255 + alpha * g * 255)
-        b = int((1 - alpha) * 255 + alpha * b * 255)
-        return f'rgb({r},{g},{b})'
-
     # Build colormaps
+    ramp_colors = ["#edf8fb", "#b3cde3", "#2b8cbe"]  # Light to medium blues
     colormaps = {}
     for col in data_layers:
         colormap = LinearColormap(
-            colors=["#edf8fb", "#b3cde3", "#2b8cbe"],  # Light to medium blues
+            colors=ramp_colors,
             vmin=1,
             vmax=max_vals[col]
         )
         colormap.caption = "Requests per ZIP Code"
         colormaps[col] = colormap
 
+    # Polygons are filled from one shared palette: white for zero requests, then `color_bins`
+    # shades spanning each layer's scale from 1 to its maximum
+    color_bins = 9
+    shades = LinearColormap(colors=ramp_colors, vmin=0, vmax=color_bins - 1)
+    palette = ["white"] + [shades(i) for i in range(color_bins)]
+
     # ===========================
     # Merge ZIP geometry with request data
     # ===========================
-    merged = gdf.merge(df, how="left", left_on="ZIPNUM", right_index=True)
+    # Join on integer ZIP indexes so rows align by index instead of hashing ZIP strings;
+    # non-numeric labels become <NA> and are left unmatched, like a string merge would
+    zip_keys = pd.to_numeric(df_no_unknown.index.to_series(), errors="coerce").astype("Int32")
+    zip_counts = df_no_unknown.set_axis(zip_keys)[zip_keys.notna().to_numpy()]
+    gdf_keys = pd.to_numeric(gdf["ZIPNUM"], errors="coerce").astype("Int32")
+    merged = gdf.set_index(gdf_keys).join(zip_counts, how="left").reset_index(drop=True)
     for col in df.columns:
         if pd.api.types.is_numeric_dtype(df[col]):
             merged[col] = merged[col].fillna(0)  # Assume 0 requests where data is missing
 
-    # Re-infer object types
-    merged = merged.infer_objects(copy=False)  # Optional cleanup step
-
     # ===========================
     # Setup folium map
     # ===========================
-    m = folium.Map(location=[35.8, -78.7], zoom_start=10, control_scale=True, name="map")
+    # Only the uncontrolled tile layer below is added, so the layer radios list data layers alone
+    m = folium.Map(location=[35.8, -78.7], zoom_start=10, control_scale=True, name="map", tiles=None)
     folium.TileLayer("openstreetmap", control=False).add_to(m)
 
-    # Compute centroids (in projected space, then convert back to match map CRS)
-    projected = merged.to_crs(epsg=3857)
-    merged["centroid"] = projected.centroid.to_crs(merged.crs)
+    # Compute label centroids directly in lat/lon; ZIP polygons are small enough that
+    # the distortion versus a projected centroid is negligible for label placement
+    centroids = shapely.centroid(merged.geometry.to_numpy())
+    cx, cy = shapely.get_x(centroids), shapely.get_y(centroids)
 
     # For dynamic legend logic
     legend_id = "dynamic-legend"
-    legend_js = ""
+
+    # ZIP names are optional in the boundary file; fall back to a placeholder
+    if "ZIPNAME" not in merged.columns:
+        merged["ZIPNAME"] = "Unknown"
+
+    # Cast request counts to whole numbers once, for feature properties, bins and labels alike
+    merged[data_layers] = merged[data_layers].astype("int32")
+    int_vals = {col: merged[col].to_numpy() for col in data_layers}
+    polygon_style = {"color": "black", "weight": 1, "fillOpacity": 0.7}
 
     # ===========================
     # Build each data layer (month or aggregate)
     # ===========================
-    for layer_name in data_layers:
-        group = folium.FeatureGroup(name=layer_name, show=(layer_name == "Aggregate"), overlay=False, control=True)
-
-        # Add ZIP polygons
-        for _, row in merged.iterrows():
-            value = row[layer_name]
-            zip_str = row["ZIPNUM"]
-            is_zero = value == 0
-            color = "white" if is_zero else colormaps[layer_name](value)
-
-            folium.GeoJson(
-                row.geometry,
-                style_function=lambda _, color=color: {
-                    "fillColor": color,
-                    "color": "black",
-                    "weight": 1,
-                    "fillOpacity": 0.7,
-                },
-                tooltip=folium.Tooltip(
-                    f"<b>Zip Code:</b> {zip_str}<br>"
-                    f"<b>Zip Name:</b> {row.get('ZIPNAME', 'Unknown')}<br>"
-                    f"<b>Requests:</b> {int(value)}"
-                ),
-                highlight_function=lambda _: {
-                    "weight": 3,
-                    "color": "black",
-                    "fillColor": "rgba(255, 255, 180, 0.8)",  # Pale yellow highlight
-                    "fillOpacity": 0.7
-                },
-                options={"pane": "shadowPane"}
-            ).add_to(group)
-
-        # Add label with request count at ZIP centroid
-        for _, row in merged.iterrows():
-            val = row[layer_name]
-            x, y = row["centroid"].x, row["centroid"].y
-            folium.map.Marker(
-                [y, x],
-                icon=folium.DivIcon(html=f"<div style='font-size:10pt;font-weight:bold'>{int(val)}</div>")
-            ).add_to(group)
+    def build_layer(layer_name: str) -> tuple:
+        """Bin one layer's counts and build its label group and legend HTML."""
+        # Quantize counts into palette indexes; bin edges sit halfway between the shades' request counts
+        shade_counts = np.linspace(1, max_vals[layer_name], color_bins)
+        edges = (shade_counts[:-1] + shade_counts[1:]) / 2
+        values = int_vals[layer_name]
+        shade_ids = np.minimum(np.digitize(values, edges) + 1, color_bins)
+        layer_bins = np.where(values == 0, 0, shade_ids).astype("uint8")
 
-        group.add_to(m)
+        group = folium.FeatureGroup(name=layer_name, show=(layer_name == initial_layer), overlay=False, control=True)
+
+        # Add labels with request counts at ZIP centroids, drawn on one canvas per layer
+        CanvasLabels(cy, cx, ["%d" % value for value in values]).add_to(group)
 
-        # ===========================
         # Build dynamic legend HTML for this layer
-        # ===========================
         unknown_count = int(df.loc["Unknown", layer_name]) if "Unknown" in df.index else 0
+        legend = build_legend_html(layer_name, colormaps[layer_name], max_vals[layer_name], unknown_count)
 
-        legend_colormap = colormaps[layer_name]
-        start_color = simulate_opacity(legend_colormap(1), 0.7)
-        end_color = simulate_opacity(legend_colormap(max_vals[layer_name]), 0.7)
-
-        svg_legend = f"""
-        <div style='line-height:1.3'>
-          <b>Requests per ZIP Code</b><br>
-          <svg width="100%" height="20">
-            <defs>
-              <linearGradient id="grad_{layer_name}" x1="0%" y1="0%" x2="100%" y2="0%">
-                <stop offset="0%" stop-color="{start_color}"/>
-                <stop offset="100%" stop-color="{end_color}"/>
-              </linearGradient>
-            </defs>
-            <rect width="100%" height="20" fill="url(#grad_{layer_name})"/>
-          </svg>
-          <div style="display:flex; justify-content:space-between">
-            <span>1</span><span>{max_vals[layer_name]}</span>
-          </div>
-        </div>
-        """.replace("\n", "")
-
-        legend_js += f"""
-        if (e.name === "{layer_name}") {{
-          document.getElementById('{legend_id}').innerHTML = `{svg_legend}<div><b>Unknown ZIPs:</b> {unknown_count}</div>`;
-        }}
-        """
+        return layer_bins, group, legend
+
+    # Layers are independent, so build them concurrently and collect results in data_layers order
+    with ThreadPoolExecutor(max_workers=min(len(data_layers), os.cpu_count() or 1)) as executor:
+        built_layers = dict(zip(data_layers, executor.map(build_layer, data_layers)))
+    bin_ids = {layer_name: built[0] for layer_name, built in built_layers.items()}
+    legends = {layer_name: built[2] for layer_name, built in built_layers.items()}
 
     # ===========================
-    # Initial legend content and JS
+    # Add ZIP polygons once, carrying every data layer as a feature property
     # ===========================
-    initial_layer = "Aggregate"
-    unknown_initial = int(df.loc["Unknown", initial_layer]) if "Unknown" in df.index else 0
-    legend_colormap = getattr(linear, "Blues_09").scale(1, max_vals[initial_layer])
-    start_color = simulate_opacity(legend_colormap(1), 0.7)
-    end_color = simulate_opacity(legend_colormap(max_vals[initial_layer]), 0.7)
-
-    init_legend = f"""
-    <div style='line-height:1.3'>
-      <b>Requests per ZIP Code</b><br>
-      <svg width="100%" height="20">
-        <defs>
-          <linearGradient id="grad_{initial_layer}" x1="0%" y1="0%" x2="100%" y2="0%">
-            <stop offset="0%" stop-color="{start_color}"/>
-            <stop offset="100%" stop-color="{end_color}"/>
-          </linearGradient>
-        </defs>
-        <rect width="100%" height="20" fill="url(#grad_{initial_layer})"/>
-      </svg>
-      <div style="display:flex; justify-content:space-between">
-        <span>1</span><span>{max_vals[initial_layer]}</span>
-      </div>
-    </div>
-    """
+    if pmtiles_path:
+        # Vector tiles can't hold array properties, so each layer's bin gets its own b<i> column
+        tile_features = merged[["geometry", "ZIPNUM", "ZIPNAME"]].copy()
+        for i, col in enumerate(data_layers):
+            tile_features[f"b{i}"] = bin_ids[col]
+        build_pmtiles(tile_features, pmtiles_path, data_layer="zips")
+
+        ZipVectorTiles(
+            url=pmtiles_url,
+            data_layer="zips",
+            layers=data_layers,
+            palette=palette,
+            initial_layer=initial_layer,
+            style=polygon_style
+        ).add_to(m)
+    else:
+        # Simplify the ZIPs as one coverage so neighbors keep their shared borders (no slivers or double
+        # edges); the tolerance keeps every boundary within ~50 m of the original, under half a pixel at
+        # zoom_start=10. Vector tiles skip this since tippecanoe generalizes per zoom level and keeps shared
+        # borders together itself (--detect-shared-borders in build_pmtiles)
+        zip_features = merged[["geometry", "ZIPNUM", "ZIPNAME"]].copy()
+        zip_features.geometry = shapely.coverage_simplify(zip_features.geometry.to_numpy(), tolerance=0.0002)
+        zip_features = zip_features.to_geo_dict()
+
+        # Per-layer counts and bins ride along as arrays ordered like data_layers
+        counts = np.column_stack([int_vals[col] for col in data_layers])
+        bins = np.column_stack([bin_ids[col] for col in data_layers])
+        for feature, feature_counts, feature_bins in zip(zip_features["features"], counts, bins):
+            feature["properties"]["counts"] = feature_counts
+            feature["properties"]["bins"] = feature_bins
+
+        ZipChoropleth(
+            zip_features,
+            layers=data_layers,
+            palette=palette,
+            initial_layer=initial_layer,
+            style=polygon_style,
+            highlight_style={
+                "weight": 3,
+                "color": "black",
+                "fillColor": "rgba(255, 255, 180, 0.8)",  # Pale yellow highlight
+                "fillOpacity": 0.7
+            }
+        ).add_to(m)
+
+    # Label groups drive the layer radio buttons, so attach them in data_layers order
+    for _, group, _ in built_layers.values():
+        group.add_to(m)
 
+    # ===========================
+    # Initial legend content and JS
+    # ===========================
     legend_html = f"""
     <div id="{legend_id}" style="position: fixed; bottom: 10px; right: 10px; z-index: 9999; background: white; padding: 10px; border:2px solid gray; border-radius: 4px;">
-        {init_legend}
-        <div><b>Unknown ZIPs:</b> {unknown_initial}</div>
+        {legends[initial_layer]}
     </div>
     """
 
@@ -241,19 +534,18 @@ def create_report(csv_path: str, geojson_path: str, output_path: str) -> None:
     # ===========================
     folium.LayerControl(collapsed=False).add_to(m)
 
-    # Add JavaScript to support legend switching
+    # Add JavaScript to support legend switching; the initial layer's legend is already in the page
     map_var = m.get_name()
 
-    # Force legend to sync on load with initial layer
     js_script = f"""
     <script>
     window.onload = function() {{
       const map = {map_var};
+      const legends = {to_js_literal(legends)};
       map.on('baselayerchange', function(e) {{
-        {legend_js}
+        if (!(e.name in legends)) return;  // Not one of our data layers
+        document.getElementById('{legend_id}').innerHTML = legends[e.name];
       }});
-      const event = {{ name: "{initial_layer}" }};
-      {legend_js.replace("e.name", "event.name")}
     }};
     </script>
     """
@@ -262,11 +554,21 @@ def create_report(csv_path: str, geojson_path: str, output_path: str) -> None:
 
     m.save(output_path)
 
+    # Archive tiles before the HTML, since a cached HTML marks the entry as complete; each file
+    # appears in the cache only once fully written
+    if cache_prefix:
+        if pmtiles_path:
+            atomic_copy(pmtiles_path, cache_prefix + ".pmtiles")
+        atomic_copy(output_path, cache_prefix + ".html")
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate an interactive folium map from ZIP-level request data.")
     parser.add_argument("--csv", required=True, help="Path to input CSV with ZIP code request data.")
     parser.add_argument("--geojson", required=True, help="Path to GeoJSON ZIP boundaries.")
     parser.add_argument("--output", required=True, help="Path to write the output HTML map.")
+    parser.add_argument("--pmtiles", help="Optional .pmtiles path to write ZIP polygons as a PMTiles archive (requires tippecanoe); "
+                                          "the map then loads them as vector tiles and must be served over HTTP.")
+    parser.add_argument("--cache", action="store_true", help="Reuse a cached copy of the map (from ~/.cache/extension-reports) when inputs are unchanged.")
     args = parser.parse_args()
 
-    create_report(args.csv, args.geojson, args.output)
+    create_report(args.csv, args.geojson, args.output, pmtiles_path=args.pmtiles, use_cache=args.cache)